@@ -0,0 +1,142 @@
+import os
+import sys
+
+import pytest
+from escpos.constants import FS
+from PIL import Image, ImageFont
+
+# テストモジュールのパスを追加
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tm88plus import TM88IV
+
+
+class FakeSocket:
+    """
+    送信データを記録するソケットの代用
+    """
+    def __init__(self):
+        self.sent = []
+
+    def sendall(self, data):
+        self.sent.append(bytes(data))
+
+    def shutdown(self, how):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def printer(tmp_path, monkeypatch):
+    """
+    プリンタに接続せず、送信データを FakeSocket に記録する TM88IV を作成します。
+    フォントは Pillow 内蔵フォントで代用し、絵文字フォント(broken.ttf)は読み込みエラーになります。
+    """
+    jis_files = {
+        "JIS0201.TXT": [("0x41", "0x0041"), ("0x5C", "0x00A5"), ("0x7E", "0x203E"), ("0xB1", "0xFF71")],
+        "JIS0208.TXT": [
+            ("0x82A0", "0x2422", "0x3042"), # あ
+            ("0x8160", "0x2141", "0x301C"), # 〜
+            ("0x817C", "0x215D", "0x2212"), # −
+            ("0x8191", "0x2171", "0x00A2"), # ¢
+            ("0x8192", "0x2172", "0x00A3"), # £
+            ("0x81CA", "0x224C", "0x00AC"), # ¬
+        ],
+        "JIS0212.TXT": [("0x3021", "0x4E02")], # 丂
+        "JIS0213-2004.TXT": [("0x2E22", "0x4FF1")], # 俱
+    }
+    for name, rows in jis_files.items():
+        lines = ["# test data"] + ["\t".join(row) + "\t# comment" for row in rows]
+        (tmp_path / name).write_text("\n".join(lines) + "\n")
+    (tmp_path / "font.ttf").write_bytes(b"dummy")
+    (tmp_path / "broken.ttf").write_bytes(b"not a font")
+
+    config = {
+        "jis0201_file": str(tmp_path / "JIS0201.TXT"),
+        "jis0208_file": str(tmp_path / "JIS0208.TXT"),
+        "jis0212_file": str(tmp_path / "JIS0212.TXT"),
+        "jis0213_file": str(tmp_path / "JIS0213-2004.TXT"),
+        "emoji_font_file": str(tmp_path / "broken.ttf"),
+        "kanji_font_file": str(tmp_path / "font.ttf"),
+        "fallback_font_file": str(tmp_path / "font.ttf"),
+    }
+
+    get_font = TM88IV._get_font
+    def fake_get_font(self, font_path, size, encoding='unic'):
+        if font_path == config["emoji_font_file"]:
+            return get_font(self, font_path, size, encoding) # OSError
+        return ImageFont.load_default(size)
+
+    sock = FakeSocket()
+    monkeypatch.setattr(TM88IV, "_get_font", fake_get_font)
+    monkeypatch.setattr(TM88IV, "open", lambda self, *args, **kwargs: setattr(self, "device", sock))
+
+    p = TM88IV("127.0.0.1", config=config)
+    sock.sent.clear()
+    return p, sock
+
+
+@pytest.mark.parametrize("width", [24, 12])
+def test_pack_columns_layout(width):
+    """
+    外字ビットマップが列単位・上位ビットが上の形式でパックされることを確認します。
+    （白の画素が印字ドット）
+    """
+    img = Image.new('L', (width, 24), 0)
+    assert TM88IV._pack_columns(img) == b'\x00' * (width * 3)
+
+    img.putpixel((0, 0), 255)
+    assert TM88IV._pack_columns(img) == b'\x80' + b'\x00' * (width * 3 - 1)
+
+    img = Image.new('L', (width, 24), 0)
+    img.putpixel((0, 8), 255)   # 1列目の2バイト目の最上位ビット
+    img.putpixel((1, 23), 255)  # 2列目の3バイト目の最下位ビット
+    img.putpixel((width - 1, 7), 200)
+    img.putpixel((width - 1, 6), 127)  # 濃度128未満は印字しない
+    expected = bytearray(width * 3)
+    expected[1] = 0x80
+    expected[5] = 0x01
+    expected[(width - 1) * 3] = 0x01
+    assert TM88IV._pack_columns(img) == bytes(expected)
+
+
+def test_jptext2_sends_buffered_output_on_error(printer):
+    """
+    jptext2 の途中で例外が発生しても、登録済みとして記録した外字定義は送信されることを確認します。
+    """
+    p, sock = printer
+    with pytest.raises(OSError):
+        p.jptext2("丂😁") # 絵文字フォントの読み込みで失敗
+
+    data = b''.join(sock.sent)
+    assert data.startswith(FS + b'2' + b'\xec@') # 丂 の外字定義
+    assert data.endswith(b'\xec@')
+    assert len(data) == 4 + 72 + 2
+    assert '😁' not in p._gaiji_area_by_char
+
+    sock.sent.clear()
+    p.jptext2("丂")
+    assert sock.sent == [b'\xec@']
+
+
+def test_jptext2_routes_non_cp932_characters_to_gaiji(printer):
+    """
+    CP932 で表せない JIS X 0201 の文字(¥, ‾)が外字として登録されることを確認します。
+    ASCII、半角カナ、JIS X 0208 の文字は内蔵フォントの CP932 コードで出力されます。
+    """
+    p, sock = printer
+    # 〜 − ¢ £ ¬ は CP932 の一方向変換で JIS X 0208 のコードに符号化される
+    p.jptext2("Aｱあ〜−¢£¬")
+    assert sock.sent == [b'A' + b'\xb1' + b'\x82\xa0' + b'\x81\x60' + b'\x81\x7c' + b'\x81\x91' + b'\x81\x92' + b'\x81\xca']
+    assert not p._gaiji_area_by_char
+
+    for c, k in (("¥", b'@'), ("‾", b'A')):
+        sock.sent.clear()
+        p.jptext2(c)
+        data = b''.join(sock.sent)
+        assert data.startswith(FS + b'2' + b'\xec' + k) # 外字の定義
+        assert data.endswith(b'\xec' + k)
+        assert len(data) == 4 + 72 + 2
+        assert p._gaiji_area_by_char[c] == k
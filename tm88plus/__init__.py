@@ -1 +1 @@
-from .tm88iv import TM88IV
\ No newline at end of file
+from .tm88plus import TM88IV
\ No newline at end of file
@@ -1,11 +1,55 @@
 import collections
+import contextlib
+import hashlib
+import itertools
+import marshal
 import os
+import socket
 
 import emoji
 from escpos.constants import *
 from escpos.printer import Network
 from PIL import Image, ImageDraw, ImageFont
 
+def _build_mode_cmds():
+    """
+    jptext2 の印字モード指定・解除コマンドを全組み合わせ分生成
+
+    Returns
+    -------
+    out : dict
+        (dw, dh, underline, wbreverse, bflg) をキーとした (指定コマンド, 解除コマンド)
+    """
+    cmds = {}
+    for dw, dh, underline, wbreverse, bflg in itertools.product((False, True), repeat=5):
+        n = 0x00
+        b = 0x00
+        if dw:
+            n += 0x04 # 横倍拡大
+            b += 0x10 # 横倍拡大(1バイトコード文字)
+        if dh:
+            n += 0x08 # 縦倍拡大
+            b += 0x20 # 縦倍拡大(1バイトコード文字)
+        if underline:
+            n += 0x80 # 漢字アンダーライン
+            b += 0x80 # アンダーライン(1バイトコード文字)
+
+        start = b''
+        end = b''
+        if n != 0x00:
+            if bflg:
+                start += ESC + b'!' + b.to_bytes(1, byteorder='big') # ESC ! 印字モードの一括指定(指定)
+                end += ESC + b'!' + b'\x00' # ESC ! 印字モードの一括指定(解除)
+            start += FS + b'!' + n.to_bytes(1, byteorder='big') # FS ! 漢字の印字モードの一括指定(指定)
+            end += FS + b'!' + b'\x00' # FS ! 漢字の印字モードの一括指定(解除)
+        if wbreverse:
+            start += GS + b'B' + b'\x01' # GS B 反転
+            end += GS + b'B' + b'\x00' # GS B 反転解除
+
+        cmds[(dw, dh, underline, wbreverse, bflg)] = (start, end)
+    return cmds
+
+
 class TM88IV(Network):
     """
     TM88IV: 日本語・絵文字対応 ESC/POS サーマルプリンタ用クラス
@@ -34,23 +78,13 @@ class TM88IV(Network):
     - https://github.com/lrks/python-escpos
     - https://github.com/iakyi/python-escpos-jp
     """
-    USER_AREAS_ASCII = [
-        b'\x20',b'\x21',b'\x22',b'\x23',b'\x24',b'\x25',b'\x26',b'\x27',b'\x28',b'\x29',b'\x2a',b'\x2b',b'\x2c',b'\x2d',b'\x2e',b'\x2f',
-        b'\x30',b'\x31',b'\x32',b'\x33',b'\x34',b'\x35',b'\x36',b'\x37',b'\x38',b'\x39',b'\x3a',b'\x3b',b'\x3c',b'\x3d',b'\x3e',b'\x3f',
-        b'\x40',b'\x41',b'\x42',b'\x43',b'\x44',b'\x45',b'\x46',b'\x47',b'\x48',b'\x49',b'\x4a',b'\x4b',b'\x4c',b'\x4d',b'\x4e',b'\x4f',
-        b'\x50',b'\x51',b'\x52',b'\x53',b'\x54',b'\x55',b'\x56',b'\x57',b'\x58',b'\x59',b'\x5a',b'\x5b',b'\x5c',b'\x5d',b'\x5e',b'\x5f',
-        b'\x60',b'\x61',b'\x62',b'\x63',b'\x64',b'\x65',b'\x66',b'\x67',b'\x68',b'\x69',b'\x6a',b'\x6b',b'\x6c',b'\x6d',b'\x6e',b'\x6f',
-        b'\x70',b'\x71',b'\x72',b'\x73',b'\x74',b'\x75',b'\x76',b'\x77',b'\x78',b'\x79',b'\x7a',b'\x7b',b'\x7c',b'\x7d',b'\x7e',
-    ]
-
-    USER_KANJI_AREAS_SJIS = [
-        b'\x40',b'\x41',b'\x42',b'\x43',b'\x44',b'\x45',b'\x46',b'\x47',b'\x48',b'\x49',b'\x4a',b'\x4b',b'\x4c',b'\x4d',b'\x4e',b'\x4f',
-        b'\x50',b'\x51',b'\x52',b'\x53',b'\x54',b'\x55',b'\x56',b'\x57',b'\x58',b'\x59',b'\x5a',b'\x5b',b'\x5c',b'\x5d',b'\x5e',b'\x5f',
-        b'\x60',b'\x61',b'\x62',b'\x63',b'\x64',b'\x65',b'\x66',b'\x67',b'\x68',b'\x69',b'\x6a',b'\x6b',b'\x6c',b'\x6d',b'\x6e',b'\x6f',
-        b'\x70',b'\x71',b'\x72',b'\x73',b'\x74',b'\x75',b'\x76',b'\x77',b'\x78',b'\x79',b'\x7a',b'\x7b',b'\x7c',b'\x7d',b'\x7e',
-        b'\x80',b'\x81',b'\x82',b'\x83',b'\x84',b'\x85',b'\x86',b'\x87',b'\x88',b'\x89',b'\x8a',b'\x8b',b'\x8c',b'\x8d',b'\x8e',b'\x8f',
-        b'\x90',b'\x91',b'\x92',b'\x93',b'\x94',b'\x95',b'\x96',b'\x97',b'\x98',b'\x99',b'\x9a',b'\x9b',b'\x9c',b'\x9d',b'\x9e',
-    ]
+    USER_AREAS_ASCII = bytes(range(0x20, 0x7f)) # ダウンロード文字の定義領域(0x20～0x7e)
+
+    USER_KANJI_AREAS_SJIS = bytes(range(0x40, 0x7f)) + bytes(range(0x80, 0x9f)) # 外字の第2バイト(0x40～0x7e, 0x80～0x9e)
+
+    GLYPH_CACHE_SIZE = 1024 # 外字ビットマップのキャッシュ上限数
+
+    _MODE_CMDS = _build_mode_cmds() # jptext2 の印字モード指定・解除コマンド
 
     def __init__(self, host, port=9100, timeout=60, config=None, *args, **kwargs):
         """
@@ -83,6 +117,7 @@ class TM88IV(Network):
             - fallback_font_size: Size of the fallback font
             - fallback_font_adjust_x: X-axis adjustment for fallback font rendering
             - fallback_font_adjust_y: Y-axis adjustment for fallback font rendering
+            - cache_dir: Directory for the parsed JIS data cache (optional, disabled by default)
         """
         config = config or {}
         # Default configuration values
@@ -119,6 +154,8 @@ class TM88IV(Network):
         self._fallback_font_size = int(config.get('fallback_font_size', 24))
         self._fallback_font_adjust_x = int(config.get('fallback_font_adjust_x', 2))
         self._fallback_font_adjust_y = int(config.get('fallback_font_adjust_y', 0))
+        # Cache directory for the parsed JIS data (disabled if None)
+        self._cache_dir = config.get('cache_dir', None)
 
         # Check if required files exist
         required_files = [
@@ -136,16 +173,29 @@ class TM88IV(Network):
 
         super().__init__(host, port, timeout, *args, **kwargs)
 
+        self._raw_buffer = None # _buffered() 中の送信バッファ
+
         self._user_areas  = collections.OrderedDict()
         self._gaiji_areas = collections.OrderedDict()
 
         for area in self.USER_AREAS_ASCII:
-            self._user_areas[area] = ''
+            self._user_areas[bytes((area,))] = ''
 
         for area in self.USER_KANJI_AREAS_SJIS:
-            self._gaiji_areas[area] = ''
+            self._gaiji_areas[bytes((area,))] = ''
+
+        # 登録済み外字の逆引き(文字 -> 領域)
+        self._user_area_by_char  = {}
+        self._gaiji_area_by_char = {}
         
         self._font_cache = {}
+        self._emoji_set = frozenset(emoji.EMOJI_DATA) # 絵文字判定用(emoji.is_emoji と同じ判定表)
+        self._glyph_cache = collections.OrderedDict() # 外字ビットマップのキャッシュ
+        # 外字描画用のキャンバス(描画のたびに消去して再利用)
+        self._canvas24 = Image.new('L', (24,24), 0)
+        self._canvas12 = Image.new('L', (12,24), 0)
+        self._draw24 = ImageDraw.Draw(self._canvas24)
+        self._draw12 = ImageDraw.Draw(self._canvas12)
         self._c1 = b'\xec' # 外字の文字コードの第1バイト(Shift JIS)
 
         self._raw(ESC + b't' + b'\x01') # ESC t 文字コードテーブルの選択(Page1 カタカナ)
@@ -155,43 +205,139 @@ class TM88IV(Network):
         self._load_jis_character_set()
 
 
+    def open(self, *args, **kwargs):
+        """
+        TCPソケットを開き、小さな書き込みを即時送信するよう設定
+
+        外字定義などの短いコマンドが Nagle アルゴリズムで待たされないよう TCP_NODELAY を、
+        長時間の接続維持のため SO_KEEPALIVE を有効にします。
+        """
+        super().open(*args, **kwargs)
+        if self.device:
+            self.device.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.device.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+
+    def _raw(self, msg):
+        """
+        コマンドを送信(_buffered() 中はバッファに追加)
+
+        Parameters
+        ----------
+        msg : bytes
+            送信するデータ
+        """
+        if self._raw_buffer is not None:
+            self._raw_buffer += msg
+        else:
+            super()._raw(msg)
+
+
+    @contextlib.contextmanager
+    def _buffered(self):
+        """
+        ブロック内の _raw をバッファに溜め、終了時に1回で送信
+
+        外字定義(FS 2 / ESC &)も同じバッファに入るため、送信順序は変わりません。
+        ブロック内で例外が発生した場合も、それまでに溜めた分を送信してから例外を送出します。
+        入れ子で呼ばれた場合は外側のブロックでまとめて送信します。
+        """
+        if self._raw_buffer is not None:
+            yield
+            return
+
+        self._raw_buffer = bytearray()
+        try:
+            yield
+        finally:
+            # 登録済みとして記録した外字定義をプリンタへ確実に届ける
+            data = bytes(self._raw_buffer)
+            self._raw_buffer = None
+            if data:
+                super()._raw(data)
+
+
     # https://github.com/nakamura001/JIS_CharacterSet ※チルダがオーバーラインになっている
     def _load_jis_character_set(self):
         """
         JIS漢字コードをロード
         """
-        self._jis_x_0201 = []
-        self._jis_x_0208 = []
-        self._jis_x_0212 = []
-        self._jis_x_0213 = []
-    
-        # JIS X 0201
-        with open(self._jis0201_file,"r") as f:
-          for row in f:
-            if row[0] != '#':
-              c = row.split("\t")[1]
-              self._jis_x_0201.append(chr(int(c, 16)))
-
-        # JIS X 0208
-        with open(self._jis0208_file,"r") as f:
-          for row in f:
-            if row[0] != '#':
-              c = row.split("\t")[2]
-              self._jis_x_0208.append(chr(int(c, 16)))
-
-        # JIS X 0212
-        with open(self._jis0212_file,"r") as f:
-          for row in f:
-            if row[0] != '#':
-              c = row.split("\t")[1]
-              self._jis_x_0212.append(chr(int(c, 16)))
-
-        # JIS X 0213-2004
-        with open(self._jis0213_file,"r") as f:
-          for row in f:
-            if row[0] != '#':
-              c = row.split("\t")[1]
-              self._jis_x_0213.append(chr(int(c, 16)))
+        tables = (
+            (self._jis0201_file, 1), # JIS X 0201
+            (self._jis0208_file, 2), # JIS X 0208
+            (self._jis0212_file, 1), # JIS X 0212
+            (self._jis0213_file, 1), # JIS X 0213-2004
+        )
+
+        # 解析済みデータのキャッシュ(ファイルの更新日時・サイズが変わったら作り直す)
+        # 集合は1つの文字列として保存し、読み込み後に frozenset へ変換する
+        names = []
+        key = []
+        for path, column in tables:
+            st = os.stat(path)
+            names.append((os.path.abspath(path), column))
+            key.append((os.path.abspath(path), column, st.st_mtime_ns, st.st_size))
+        key = tuple(key)
+
+        cache_file = None
+        jis_sets = None
+        if self._cache_dir:
+            cache_file = os.path.join(self._cache_dir, "jis_" + hashlib.sha1(repr(names).encode()).hexdigest()[:16] + ".marshal")
+            try:
+                with open(cache_file, "rb") as f:
+                    cached_key, cached_tables = marshal.load(f)
+                if cached_key == key:
+                    jis_sets = tuple(frozenset(x) for x in cached_tables)
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
+        if jis_sets is None:
+            jis_sets = tuple(self._read_jis_table(path, column) for path, column in tables)
+            if cache_file:
+                try:
+                    os.makedirs(self._cache_dir, exist_ok=True)
+                    tmp_file = cache_file + ".%d.tmp" % os.getpid()
+                    with open(tmp_file, "wb") as f:
+                        marshal.dump((key, tuple(''.join(x) for x in jis_sets)), f)
+                    os.replace(tmp_file, cache_file)
+                except OSError:
+                    pass
+
+        # jptext2 で1文字ごとに所属判定するため frozenset で保持
+        self._jis_x_0201, self._jis_x_0208, self._jis_x_0212, self._jis_x_0213 = jis_sets
+
+        # 内蔵フォントで印字する文字(ASCII, JIS X 0201, JIS X 0208)の CP932 バイト列
+        # CP932 で表せない文字(¥, ‾ など)は登録せず外字で印字する
+        self._cp932_map = {}
+        for c in itertools.chain(map(chr, range(0x80)), self._jis_x_0201, self._jis_x_0208):
+            try:
+                self._cp932_map[c] = c.encode('cp932')
+            except UnicodeEncodeError:
+                pass
+        # 漢字フォントの外字で印字する文字(内蔵フォントの文字は _cp932_map を優先)
+        self._kanji_chars = self._jis_x_0212 | self._jis_x_0213
+
+
+    @staticmethod
+    def _read_jis_table(path, column):
+        """
+        JISデータファイルからUnicode文字の集合を読み込み
+
+        Parameters
+        ----------
+        path : str
+            JISデータファイルのパス
+        column : int
+            Unicodeコードポイントが記載されている列(タブ区切り)
+
+        Returns
+        -------
+        out : frozenset
+            Unicode文字の集合
+        """
+        with open(path,"r") as f:
+            lines = f.read().splitlines()
+        return frozenset(chr(int(line.split("\t")[column], 16)) for line in lines if line and line[0] != '#')
 
 
     def _get_font(self, font_path, size, encoding='unic'):
@@ -217,6 +363,27 @@ class TM88IV(Network):
         return self._font_cache[key]
 
 
+    @staticmethod
+    def _pack_columns(img):
+        """
+        外字画像をESC/POSのビットイメージ形式(列単位、上位ビットが上)にパック
+
+        Parameters
+        ----------
+        img : Image
+            白(濃度128以上)を印字ドットとするグレースケール画像(高さ24ドット)
+
+        Returns
+        -------
+        out : bytes
+            列ごとに縦3バイト×横幅分のデータ
+        """
+        # 転置して列を行にし、1ビット画像として上から8ドット単位でパック
+        # (ディザなしの変換は濃度128以上を1とする単純な閾値処理)
+        img = img.transpose(Image.Transpose.TRANSPOSE).convert('1', dither=Image.Dither.NONE)
+        return img.tobytes()
+
+
     def _escpos_register_gaiji(self, c2, gaiji, font, size, adjustX, adjustY, asciiflg):
         """
         外字登録(ESC/POS)
@@ -238,37 +405,55 @@ class TM88IV(Network):
         asciiflg : int
             ダウンロード文字定義フラグ
         """
-        if asciiflg:
-            img = Image.new('RGB', (12,24), (255,255,255))
+        # 描画済みのビットマップがあれば再利用(LRU)
+        key = (gaiji, font, size, adjustX, adjustY, asciiflg)
+        data = self._glyph_cache.get(key)
+        if data is not None:
+            self._glyph_cache.move_to_end(key)
         else:
-            img = Image.new('RGB', (24,24), (255,255,255))
-        draw = ImageDraw.Draw(img)
-        f = self._get_font(font, size, encoding='unic')
-        draw.text((adjustX,adjustY), gaiji, fill=(0,0,0), font=f)
-        img = img.convert('1')
-
-        byte_array = []
-        bit_str = ''
-        for x in range(img.width):
-            for y in range(img.height):
-                pixel = img.getpixel((x,y))
-                if pixel == 255:
-                    bit_str += '0'
-                else:
-                    bit_str += '1'
+            # 黒地に白で描画し、白(濃度128以上)を印字ドット(1)とする
+            if asciiflg:
+                img, draw = self._canvas12, self._draw12
+            else:
+                img, draw = self._canvas24, self._draw24
+            draw.rectangle((0, 0, img.width, img.height), fill=0) # 前回の描画を消去
+            f = self._get_font(font, size, encoding='unic')
+            draw.text((adjustX,adjustY), gaiji, fill=255, font=f)
 
-                if not (y + 1) % 8:
-                    byte_array.append(int(bit_str, 2).to_bytes(1, 'big'))
-                    bit_str = ''
+            data = self._pack_columns(img)
+
+            self._glyph_cache[key] = data
+            if len(self._glyph_cache) > self.GLYPH_CACHE_SIZE:
+                self._glyph_cache.popitem(last=False)
 
         if asciiflg:
-            self._raw(ESC + b'&' + b'\x03' + c2 + c2) # ESC & ダウンロード文字の定義
-            self._raw(b'\x0c')
+            # ESC & ダウンロード文字の定義(y=3, c1=c2, x=横ドット数 の後にデータが続く)
+            header = ESC + b'&' + b'\x03' + c2 + c2 + (len(data) // 3).to_bytes(1, byteorder='big')
         else:
-            self._raw(FS + b'2' + self._c1 + c2) # FS 2 外字の定義
+            header = FS + b'2' + self._c1 + c2 # FS 2 外字の定義
+
+        self._raw(header + data)
 
-        for byte in byte_array:
-            self._raw(byte)
+
+    def _lookup_gaiji(self, gaiji):
+        """
+        登録済み外字の検索(見つかった場合は LRU の順序を更新)
+
+        Parameters
+        ----------
+        gaiji : str
+            外字文字
+
+        Returns
+        -------
+        out : byte or None
+            外字文字(未登録の場合は None)
+        """
+        k = self._gaiji_area_by_char.get(gaiji)
+        if k is None:
+            return None
+        self._gaiji_areas.move_to_end(k) # 最後尾へ移動
+        return self._c1 + k
 
 
     def _define_gaiji(self, gaiji, font, size=18, adjustX=0, adjustY=0, asciiflg=False):
@@ -303,33 +488,35 @@ class TM88IV(Network):
         """
         # ダウンロード文字
         if asciiflg:
-            for k, v in self._user_areas.items():
-                if v == gaiji:
-                    self._user_areas[k] = self._user_areas.pop(k) # 削除して追加
-                    return ESC + b'%' +' \x01' + k + ESC + b'%' + b'\x00' # ダウンロード文字セットの指定・解除
+            k = self._user_area_by_char.get(gaiji)
+            if k is not None:
+                self._user_areas.move_to_end(k) # 最後尾へ移動
+            else:
+                k, v = next(iter(self._user_areas.items())) # 最も古い領域を再利用
+                self._escpos_register_gaiji(k,gaiji,font,size,adjustX,adjustY,asciiflg) # 定義または再定義
 
-            for k, v in self._user_areas.items():
-                self._user_areas.pop(k)
+                # 定義に成功してから領域の割り当てを更新
+                self._user_area_by_char.pop(v, None)
                 self._user_areas[k] = gaiji
-
-                self._escpos_register_gaiji(k,gaiji,font,size,adjustX,adjustY,asciiflg) # 定義または再定義
-                return ESC + b'%' + b'\x01' + k + ESC + b'%' + b'\x00'    # ダウンロード文字セットの指定・解除
+                self._user_areas.move_to_end(k)
+                self._user_area_by_char[gaiji] = k
+            return ESC + b'%' + b'\x01' + k + ESC + b'%' + b'\x00' # ダウンロード文字セットの指定・解除
 
         # 外字
         else:
-            for k, v in self._gaiji_areas.items():
-                if v == gaiji:
-                    self._gaiji_areas[k] = self._gaiji_areas.pop(k) # 削除して追加
-                    return self._c1 + k
+            binary_str = self._lookup_gaiji(gaiji)
+            if binary_str is not None:
+                return binary_str
 
-            for k, v in self._gaiji_areas.items():
-                self._gaiji_areas.pop(k)
-                self._gaiji_areas[k] = gaiji
+            k, v = next(iter(self._gaiji_areas.items())) # 最も古い領域を再利用
+            self._escpos_register_gaiji(k,gaiji,font,size,adjustX,adjustY,asciiflg) # 定義または再定義
 
-                self._escpos_register_gaiji(k,gaiji,font,size,adjustX,adjustY,asciiflg) # 定義または再定義
-                return self._c1 + k
-
-        return b''
+            # 定義に成功してから領域の割り当てを更新
+            self._gaiji_area_by_char.pop(v, None)
+            self._gaiji_areas[k] = gaiji
+            self._gaiji_areas.move_to_end(k)
+            self._gaiji_area_by_char[gaiji] = k
+            return self._c1 + k
 
 
     def jptext2(self, text, dw=False, dh=False, underline=False, wbreverse=False, bflg=False):
@@ -351,68 +538,59 @@ class TM88IV(Network):
         bflg : bool
             1バイトコード文字にも適用(横倍拡大、縦倍拡大)
         """
-        n = 0x00
-        b = 0x00
-        if dw:
-            n += 0x04 # 横倍拡大
-            b += 0x10 # 横倍拡大(1バイトコード文字)
-        if dh:
-            n += 0x08 # 縦倍拡大
-            b += 0x20 # 縦倍拡大(1バイトコード文字)
-        if underline:
-            n += 0x80 # 漢字アンダーライン
-            b += 0x80 # アンダーライン(1バイトコード文字)
-        if n != 0x00:
-            if bflg:
-                self._raw(ESC + b'!' + b.to_bytes(1, byteorder='big')) # ESC ! 印字モードの一括指定(指定)
-            self._raw(FS + b'!' + n.to_bytes(1, byteorder='big')) # FS ! 漢字の印字モードの一括指定(指定)
-        if wbreverse:
-            self._raw(GS + b'B' + b'\x01') # GS B 反転
-
-        binary_str = b''
-        call_define = False
-        for c in text:
-            if c.isascii() or c in self._jis_x_0201 or c in self._jis_x_0208:
-                # Built-in Kanji Font
-                binary_str = c.encode('cp932','ignore')
-                call_define = False
-            elif c in self._jis_x_0212 or c in self._jis_x_0213:
-                # Kanji Font
-                params = dict(
-                    font=self._kanji_font_file,
-                    size=self._kanji_font_size,
-                    adjustX=self._kanji_font_adjust_x,
-                    adjustY=self._kanji_font_adjust_y,
-                    asciiflg=False)
-                call_define = True
-            elif emoji.is_emoji(c):
-                # Emoji Font
-                params = dict(
-                    font=self._emoji_font_file,
-                    size=self._emoji_font_size,
-                    adjustX=self._emoji_font_adjust_x,
-                    adjustY=self._emoji_font_adjust_y,
-                    asciiflg=False)
-                call_define = True
-            else:
-                # Fallback Font
-                params = dict(
-                    font=self._fallback_font_file,
-                    size=self._fallback_font_size,
-                    adjustX=self._fallback_font_adjust_x,
-                    adjustY=self._fallback_font_adjust_y,
-                    asciiflg=False)
-                call_define = True
-
-            if call_define:
+        start, end = self._MODE_CMDS[(bool(dw), bool(dh), bool(underline), bool(wbreverse), bool(bflg))]
+
+        # 外字定義を含む出力をまとめて1回で送信
+        with self._buffered():
+            self._raw(start) # 印字モードの指定
+
+            run = [] # 内蔵フォント・登録済み外字で印字する連続した文字のバイト列(まとめて送信)
+            for c in text:
+                binary_str = self._cp932_map.get(c)
+                if binary_str is not None:
+                    # Built-in Kanji Font
+                    run.append(binary_str)
+                    continue
+
+                binary_str = self._lookup_gaiji(c)
+                if binary_str is not None:
+                    # Registered gaiji
+                    run.append(binary_str)
+                    continue
+
+                if c in self._kanji_chars:
+                    # Kanji Font
+                    params = dict(
+                        font=self._kanji_font_file,
+                        size=self._kanji_font_size,
+                        adjustX=self._kanji_font_adjust_x,
+                        adjustY=self._kanji_font_adjust_y,
+                        asciiflg=False)
+                elif c in self._emoji_set:
+                    # Emoji Font
+                    params = dict(
+                        font=self._emoji_font_file,
+                        size=self._emoji_font_size,
+                        adjustX=self._emoji_font_adjust_x,
+                        adjustY=self._emoji_font_adjust_y,
+                        asciiflg=False)
+                else:
+                    # Fallback Font
+                    params = dict(
+                        font=self._fallback_font_file,
+                        size=self._fallback_font_size,
+                        adjustX=self._fallback_font_adjust_x,
+                        adjustY=self._fallback_font_adjust_y,
+                        asciiflg=False)
+
+                if run:
+                    self._raw(b''.join(run))
+                    run.clear()
+
                 # Register gaiji
-                binary_str = self._define_gaiji(gaiji=c, **params)
+                self._raw(self._define_gaiji(gaiji=c, **params))
 
-            self._raw(binary_str)
+            if run:
+                self._raw(b''.join(run))
 
-        if n != 0x00:
-            if bflg:
-                self._raw(ESC + b'!' + b'\x00') # ESC ! 印字モードの一括指定(解除)
-            self._raw(FS + b'!' + b'\x00') # FS ! 漢字の印字モードの一括指定(解除)
-        if wbreverse:
-            self._raw(GS + b'B' + b'\x00') # GS B 反転解除
+            self._raw(end) # 印字モードの解除